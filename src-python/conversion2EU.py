@@ -5,10 +5,12 @@ Natural Earth Admin-1 → European provinces (GeoPandas edition, v2.2 – resili
 Result: the script completes happily whether the NE dump provides `ISO_A2`,
 `iso_a2`, or none at all.  Tested on multiple mirrors + Pandas 2.1/2.2.
 """
+import urllib.request
 from pathlib import Path
 from typing import Mapping, Optional
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 
 # ────────────────────────────────────────────────────────── 0. FILES
@@ -23,9 +25,36 @@ NE_COUNTRIES_URL = (
     "https://naturalearth.s3.amazonaws.com/"
     "110m_cultural/ne_110m_admin_0_countries.zip"
 )
+CACHE_DIR = Path("~/.cache/naturalearth").expanduser()
+
+# (minx, miny, maxx, maxy) in EPSG:4326, pushed down into the admin-1 read.
+# Covers the Azores/Canaries (W, S), Svalbard (N) and Russia up to the Urals
+# (E); Cyprus falls inside. Features merely touching the box are kept too.
+EUROPE_BBOX = (-32.0, 27.0, 70.0, 82.0)
+
+
+def fetch(url: str) -> Path:
+    """Return a local copy of *url*, downloading it into CACHE_DIR only once."""
+    path = CACHE_DIR / url.rsplit("/", 1)[-1]
+    if not path.exists():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".part")
+        urllib.request.urlretrieve(url, tmp)
+        tmp.replace(path)  # never leave a truncated zip behind
+    return path
+
+
+def to_wgs84(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Return *gdf* in EPSG:4326, skipping the reprojection if it already is."""
+    if gdf.crs is None:
+        return gdf.set_crs(4326)
+    if gdf.crs.to_epsg() != 4326:
+        return gdf.to_crs(4326)
+    return gdf
+
 
 # ──────────────────────────────────────────────────────── 2. PREP COUNTRIES
-world = gpd.read_file(NE_COUNTRIES_URL).to_crs(4326)
+world = to_wgs84(gpd.read_file(fetch(NE_COUNTRIES_URL), engine="pyogrio", use_arrow=True))
 
 # --------------------------- 2a. Find ISO‑3 + names (case insensitive)
 ISO3_COL = next(c for c in ["iso_a3", "ISO_A3", "ISO_A3_EH", "ADM0_A3"] if c in world)
@@ -47,9 +76,11 @@ else:
 europe_mask = (world["CONTINENT"] == "Europe") | (world["NAME"].isin(["Cyprus"]))
 
 cols_to_keep = [ISO3_COL, "iso2", *NAME_COLS, "geometry"]
-europe = world.loc[europe_mask, cols_to_keep]
+europe = world.loc[europe_mask, cols_to_keep].copy()
 
-europe["iso2"] = europe["iso2"].astype("string")  # ensure .str works even if all NaN
+# Arrow-backed strings: vectorised .str kernels, and .str works even if all NaN
+for c in [ISO3_COL, "iso2", *NAME_COLS]:
+    europe[c] = europe[c].astype("string[pyarrow]")
 
 # --------------------------- 2c. Build ISO sets
 EURO_ISO3 = set(europe[ISO3_COL].dropna().str.upper())
@@ -68,11 +99,8 @@ if not EURO_ISO2:
         EURO_ISO2 = set()  # fallback – spatial filter will still catch everything
 
 # lowercase name set for case‑insensitive comparison later
-EURO_NAMES_CI = {
-    str(name).casefold()
-    for name in pd.concat([europe[c] for c in NAME_COLS])
-    if pd.notna(name)
-}
+names = pd.Series(np.concatenate([europe[c].to_numpy() for c in NAME_COLS]), dtype="string[pyarrow]")
+EURO_NAMES_CI = set(names.dropna().str.casefold().unique().tolist())
 
 # ──────────────────────────────────────────────────────── 3. HELPERS
 CANDIDATE_FIELDS = [
@@ -84,6 +112,14 @@ CANDIDATE_FIELDS = [
     "iso_a3", "ISO_A3", "ADM0_A3",
 ]
 
+# one hashed set for all three lookups; ISO keys carry their length so a
+# 2-letter value can never match an ISO-3 code (and vice versa)
+LOOKUP = frozenset(
+    {f"2:{x}" for x in EURO_ISO2}
+    | {f"3:{x}" for x in EURO_ISO3}
+    | {f"n:{x}" for x in EURO_NAMES_CI}
+)
+
 def is_european(props: Mapping) -> bool:
     """Return **True** iff *props* belongs to a European country."""
     for fld in CANDIDATE_FIELDS:
@@ -93,44 +129,69 @@ def is_european(props: Mapping) -> bool:
         if not val:
             continue
         val_s = str(val).strip()
-        # ISO‑2 → ISO‑3 → names (all case‑insensitive)
-        if len(val_s) == 2 and val_s.upper() in EURO_ISO2:
-            return True
-        if len(val_s) == 3 and val_s.upper() in EURO_ISO3:
-            return True
-        if val_s.casefold() in EURO_NAMES_CI:
+        # ISO‑2 / ISO‑3 → names (all case‑insensitive)
+        if (
+            f"{len(val_s)}:{val_s.upper()}" in LOOKUP
+            or f"n:{val_s.casefold()}" in LOOKUP
+        ):
             return True
     return False
 
+def european_mask(df: pd.DataFrame) -> np.ndarray:
+    """Column-wise version of :func:`is_european` for flat attribute tables."""
+    masks = [np.zeros(len(df), dtype=bool)]
+    for fld in CANDIDATE_FIELDS:
+        if fld not in df.columns:
+            continue
+        # normalise each distinct value once, then broadcast via the codes
+        cat = df[fld].astype("string[pyarrow]").str.strip().astype("category")
+        values = cat.cat.categories.to_series().astype("string[pyarrow]")
+        hit = (
+            (values.str.len().astype("string") + ":" + values.str.upper()).isin(LOOKUP)
+            | ("n:" + values.str.casefold()).isin(LOOKUP)
+        ).to_numpy(dtype=bool)
+        # trailing False so that code -1 (missing value) maps to "not European"
+        masks.append(np.append(hit, False)[cat.cat.codes.to_numpy()])
+    return np.logical_or.reduce(masks)
+
 # ──────────────────────────────────────────────────────── 4. LOAD PROVINCES
-provinces = gpd.read_file(NE_ADMIN1_URL)
-provinces = provinces.to_crs(4326) if provinces.crs else provinces.set_crs(4326)
+provinces = gpd.read_file(
+    fetch(NE_ADMIN1_URL), engine="pyogrio", use_arrow=True, bbox=EUROPE_BBOX
+)
+provinces = to_wgs84(provinces)
 
 # ─────────────────────────────────────────────── 5. ATTRIBUTE FILTER
-if (
+# O(1) probe: nested dicts only ever show up as an object column
+has_props_dict = (
     "properties" in provinces.columns
-    and provinces["properties"].apply(lambda x: isinstance(x, dict)).all()
-):
-    mask_attr = provinces["properties"].apply(is_european)
+    and len(provinces) > 0
+    and provinces["properties"].dtype == object
+    and isinstance(provinces["properties"].iloc[0], dict)
+)
+if has_props_dict:
+    mask_attr = provinces["properties"].apply(is_european).to_numpy(dtype=bool)
 else:
-    mask_attr = provinces.apply(is_european, axis=1)
+    mask_attr = european_mask(provinces)
 
 attr_hits = provinces[mask_attr]
 rest = provinces[~mask_attr]
 
 # ─────────────────────────────────────────────── 6. SPATIAL FALL‑BACK
-proj_crs = 3035  # LAEA Europe – good compromise for continental centroiding
-rest_cent = rest.to_crs(proj_crs).centroid.to_crs(4326)
-rest_cent_df = gpd.GeoDataFrame(geometry=rest_cent, crs=4326)
-
-rest_joined = gpd.sjoin(
-    rest_cent_df,
-    europe[[ISO3_COL, "geometry"]],
-    how="inner",
-    predicate="intersects",  # forgiving near coarse coastlines
-    rsuffix="_eu",
+# representative_point() is guaranteed to lie inside its polygon, so no
+# reprojection is needed to get a usable point in EPSG:4326
+rest_pts = rest.geometry.representative_point()
+
+# one (multi)polygon per country → fewer STRtree leaves and candidates
+# dropna=False: countries without an ISO-3 value must stay in the tree
+europe_dissolved = europe.dissolve(by=ISO3_COL, as_index=False, dropna=False)[
+    [ISO3_COL, "geometry"]
+]
+
+# query the (lazily built, cached) STRtree of the countries directly
+rest_idx, _ = europe_dissolved.sindex.query(
+    rest_pts.values, predicate="intersects"
 )
-spat_hits = rest.loc[rest_joined.index]
+spat_hits = rest.iloc[np.unique(rest_idx)]
 
 # ─────────────────────────────────────────────── 7. MERGE & SAVE
 european_provinces = pd.concat([attr_hits, spat_hits]).sort_index()
@@ -156,5 +217,6 @@ if "name_en" in european_provinces.columns and "name" in european_provinces.colu
     )
     european_provinces = european_provinces.drop(columns=["name_en"])
 
-european_provinces.to_file(OUT_PATH, driver="GeoJSON")
+# GeoJSON stays the output format – the app reads this file via readJSON.
+european_provinces.to_file(OUT_PATH, driver="GeoJSON", engine="pyogrio")
 print(f"✅  {len(european_provinces):,} provinces kept → {OUT_PATH}")
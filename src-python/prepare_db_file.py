@@ -1,12 +1,14 @@
-from tkinter import Tk, filedialog
+import argparse
 import duckdb
-import random
+import numpy as np
 import shutil
 import os
 import polars as pl
 
 def get_duckdb_in_path():
-    Tk().withdraw()   
+    # interactive fallback, only imported when no --in path is given
+    from tkinter import Tk, filedialog
+    Tk().withdraw()
     file = filedialog.askopenfilename(filetypes=[("duckdb file", ".duckdb")])
     return file
 
@@ -17,6 +19,14 @@ def get_duckdb_out_path(input_path):
     enhanced_filename = f"{name}Enhanced{ext}"
     return os.path.join(directory, enhanced_filename)
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Copy a DuckDB file and enrich it with example category metadata."
+    )
+    parser.add_argument("--in", dest="inp", help="input .duckdb file (file dialog if omitted)")
+    parser.add_argument("--out", help="output .duckdb file (default: <input>Enhanced.duckdb)")
+    return parser.parse_args(argv)
+
 # BFS
 category_df = pl.DataFrame({
     'name': [
@@ -76,104 +86,98 @@ recursive_root_leaf_sql = """
 """
 
 
-# 1) select in- and output-file
-file = get_duckdb_in_path()
-out_path = get_duckdb_out_path(file)
-shutil.copy2(file, out_path)
-
-try:
+def enrich_db_file(out_path):
+    # 2) open output file, everything below runs in one transaction
     conn = duckdb.connect(out_path)
+    conn.execute("PRAGMA disable_progress_bar;")
+    # keep pages in memory until COMMIT instead of checkpointing mid-load
+    conn.execute("SET wal_autocheckpoint = '1GB';")
 
-    # 3) make asset.asset primary key
-    # 3a) fetching schema
-    columns = conn.execute("""
-        SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_name = 'asset'
-            ORDER BY ordinal_position
-    """).fetchall()
+    try:
+        conn.execute("BEGIN TRANSACTION;")
 
+        # 3) make asset.asset primary key
+        # in place, asset_category needs it as foreign key target (DuckDB >= 1.2)
+        conn.execute("ALTER TABLE asset ADD PRIMARY KEY (asset);")
 
-    # 3b) creating part of query for CREATE
-    cols_with_types = ", ".join(f'"{col[0]}" {col[1]}' for col in columns[1:])
 
-    # 3c) creating part of query for SELECT
-    column_list = ", ".join(f'"{col[0]}"' for col in columns)
+        # 4) setup category table (ID, name, parent_ID, level)
+        # 4a) auto-generate IDS
+        conn.execute("CREATE SEQUENCE PK_category_seq START 1;")
 
-    # 3e) create table
-    create_table_sql = f"""
-        CREATE TABLE asset_new (
-            asset VARCHAR PRIMARY KEY,
-            {cols_with_types}
-        )
-    """
-    conn.execute(create_table_sql)
-
-
-    # 3f) transfer data to new table
-    insert_sql = f"""
-        INSERT INTO asset_new ({column_list})
-        SELECT {column_list} FROM asset
-    """
-    conn.execute(insert_sql)
-
-    # 3g) rename table and remove old
-    conn.execute(f"DROP TABLE asset")
-    conn.execute(f"ALTER TABLE asset_new RENAME TO asset")
-
-
-    # 4) setup category table (ID, name, parent_ID, level)
-    # 4a) auto-generate IDS
-    conn.execute("CREATE SEQUENCE PK_category_seq START 1;")
-
-    # 4b) create table
-    conn.execute("""
-        CREATE TABLE category (
-            id INTEGER PRIMARY KEY DEFAULT NEXTVAL('PK_category_seq'),
-            name VARCHAR UNIQUE NOT NULL,
-            parent_id INTEGER REFERENCES category(id),
-            level INTEGER
-        );
-    """)
-
-    # 4c) insert some example data
-    # row by row because otherwise, foreign key on self is violated
-    for row in category_df.iter_rows():
+        # 4b) create table
+        conn.execute("""
+            CREATE TABLE category (
+                id INTEGER PRIMARY KEY DEFAULT NEXTVAL('PK_category_seq'),
+                name VARCHAR UNIQUE NOT NULL,
+                parent_id INTEGER, -- no self-FK (DuckDB can't add it afterwards), not needed by the recursive CTE
+                level INTEGER
+            );
+        """)
+
+        # 4c) insert some example data
+        # in one go, ids follow the (preserved) row order of category_df
+        conn.register("cat_df", category_df.to_arrow())
         conn.execute("""
             INSERT INTO category (name, parent_id, level)
-            VALUES (?, ?, ?)
-        """, (row[0], row[1], row[2]))
-
-
-    # 5) create asset_category table ...
-    # 5a) create table
-    conn.execute("""
-        CREATE TABLE asset_category(
-            asset VARCHAR REFERENCES asset(asset),
-            root_id INTEGER NOT NULL REFERENCES category(id),
-            leaf_id INTEGER NOT NULL REFERENCES category(id),
-            PRIMARY KEY (asset, root_id)
-        );
-    """)
-
-    # 6) randomly add metadata for each asset
-    # 6a) select al level-0 category-ids for two category types
-    rows = root_leaf_ids = conn.execute(recursive_root_leaf_sql).fetchall()
-    
-    grouped = {}
-    for root_id, leaf_id in rows:
-        grouped.setdefault(root_id, []).append(leaf_id)
-    
-    # 6b) for each row in asset, add a row in asset_metadata with a random L0-category assigned
-    assets = conn.execute("SELECT asset FROM asset;").fetchall()
-    
-    for root_id in grouped.keys():
-        current_leave_ids = grouped.get(root_id)
-        for (asset,) in assets:
-            leaf_id = random.choice(current_leave_ids)
-            conn.execute(f"INSERT INTO asset_category VALUES (?, ?, ?);", (asset, root_id, leaf_id))
-    
-
-finally:
-    # cleanup
-    conn.close()
+            SELECT name, parent_id, level FROM cat_df
+        """)
+        conn.unregister("cat_df")
+
+
+        # 5) create asset_category table ...
+        # 5a) create table
+        conn.execute("""
+            CREATE TABLE asset_category(
+                asset VARCHAR REFERENCES asset(asset),
+                root_id INTEGER NOT NULL REFERENCES category(id),
+                leaf_id INTEGER NOT NULL REFERENCES category(id),
+                PRIMARY KEY (asset, root_id)
+            );
+        """)
+
+        # 6) randomly add metadata for each asset
+        # 6a) select al level-0 category-ids for two category types
+        grouped = (
+            conn.execute(recursive_root_leaf_sql).pl()
+            .group_by("root_id", maintain_order=True)
+            .agg("leaf_id")
+        )
+
+        # 6b) for each asset, add a row in asset_category per root with a random L0-category assigned
+        assets = conn.execute("SELECT asset FROM asset;").pl()
+
+        asset_category_df = pl.concat([
+            assets.with_columns(
+                root_id=pl.lit(root_id),
+                leaf_id=pl.Series(np.random.choice(np.asarray(leaf_ids, dtype=np.int64), size=assets.height)),
+            )
+            for root_id, leaf_ids in grouped.iter_rows()
+        ])
+        conn.register("ac", asset_category_df.to_arrow())
+        conn.execute("INSERT INTO asset_category SELECT asset, root_id, leaf_id FROM ac;")
+        conn.unregister("ac")
+
+        conn.execute("COMMIT;")
+
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
+
+    finally:
+        # cleanup
+        conn.close()
+
+
+def main(argv=None):
+    # 1) select in- and output-file
+    args = parse_args(argv)
+    file = args.inp or get_duckdb_in_path()
+    out_path = args.out or get_duckdb_out_path(file)
+    shutil.copy2(file, out_path)
+
+    enrich_db_file(out_path)
+
+
+if __name__ == "__main__":
+    main()
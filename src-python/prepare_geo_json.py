@@ -1,6 +1,6 @@
 import geopandas as gpd
 
-gdf = gpd.read_file("ne_10m_admin_1_states_provinces.shp") # open file
-gdf = gdf[["name_en", "geometry"]] # use english names
+# open file, only reading the english names (+ geometry)
+gdf = gpd.read_file("ne_10m_admin_1_states_provinces.shp", engine="pyogrio", columns=["name_en"], use_arrow=True)
 gdf = gdf.rename(columns={"name_en": "name"})  # cleaner output
-gdf.to_file("world_regions.geo.json", driver="GeoJSON") # output file
+gdf.to_file("world_regions.geo.json", driver="GeoJSON", engine="pyogrio") # output file